@@ -1,4 +1,5 @@
 import re
+from array import array
 
 class JsonHelperFormatters:
 
@@ -40,6 +41,87 @@ class JsonHelperFormatters:
         except Exception as e:
             return res
 
+class JsonHelperColumns(object):
+    """
+    Typed, array backed buffer for JsonHelper.get(..., columns=True) matches.
+
+    Floats are stored in array('d'), ints that fit into int64 in array('q'), strings as int64 codes into an
+    interned string table, anything else (None, bool, dict, list, huge ints) in a plain list. kinds keeps the
+    match order (see FLOAT, INTEGER, STRING, OBJECT), so values() yields the same values, in the same order,
+    as the list returned by JsonHelper.get.
+    """
+    FLOAT = 0
+    INTEGER = 1
+    STRING = 2
+    OBJECT = 3
+
+    def __init__(self, with_paths=False):
+        self.kinds = array('B')
+        self.floats = array('d')
+        self.integers = array('q')
+        self.string_codes = array('q')
+        self.string_table = []
+        self.objects = []
+        self.paths = [] if with_paths else None
+        self._string_index = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, value, path=None):
+        if isinstance(value, float):
+            self.kinds.append(self.FLOAT)
+            self.floats.append(value)
+        elif isinstance(value, int) and not isinstance(value, bool) and -2 ** 63 <= value < 2 ** 63:
+            self.kinds.append(self.INTEGER)
+            self.integers.append(value)
+        elif isinstance(value, str):
+            code = self._string_index.get(value)
+            if code is None:
+                code = self._string_index[value] = len(self.string_table)
+                self.string_table.append(value)
+            self.kinds.append(self.STRING)
+            self.string_codes.append(code)
+        else:
+            self.kinds.append(self.OBJECT)
+            self.objects.append(value)
+
+        if self.paths is not None:
+            self.paths.append(path)
+
+    def strings(self) -> list:
+        return [self.string_table[code] for code in self.string_codes]
+
+    def values(self):
+        cursors = [0, 0, 0, 0]
+        for kind in self.kinds:
+            index = cursors[kind]
+            cursors[kind] += 1
+            if kind == self.FLOAT:
+                yield self.floats[index]
+            elif kind == self.INTEGER:
+                yield self.integers[index]
+            elif kind == self.STRING:
+                yield self.string_table[self.string_codes[index]]
+            else:
+                yield self.objects[index]
+
+    def floats_to_numpy(self):
+        """ Zero-copy float64 view of the floats column (the buffer must not grow while the view is in use) """
+        import numpy as np
+        return np.frombuffer(self.floats, dtype=np.float64)
+
+    def integers_to_numpy(self):
+        """ Zero-copy int64 view of the integers column (the buffer must not grow while the view is in use) """
+        import numpy as np
+        return np.frombuffer(self.integers, dtype=np.int64)
+
+    def strings_to_pandas(self):
+        """ pandas.Categorical of the strings column. The strings are not repeated, but pandas narrows the codes dtype, so the codes are copied """
+        import numpy as np
+        import pandas as pd
+        return pd.Categorical.from_codes(np.frombuffer(self.string_codes, dtype=np.int64), categories=self.string_table)
+
 class JsonHelper(object):
     macros = ['{*}', '[*]', '{R:(']
 
@@ -54,13 +136,120 @@ class JsonHelper(object):
         if d == None: d = self.data
         return {x: d[x] for x in d.keys() if x in keys}
 
-    def get(self, value_path: str, default, nested_dict=None, results=None, formatter=None, where=None):
+    def get_columns(self, value_path: str, default, with_paths=False) -> JsonHelperColumns:
+        """
+        Same path syntax as get, but every match is appended to a single JsonHelperColumns buffer instead of
+        per-frame Python lists. The buffer holds the elements of the list get would return (or the single
+        value get returns, when it is not a list), e.g. get('/ll/[*]') on {'ll': [[1, 2], [3]]} gives [1, 2] and [3].
+        A trailing {R:(<pattern>)} adds the values of the matching keys. Defaulted values get None as their path.
+
+        Note: While the source dict is alive, the matched values already exist in it, so the buffer does not use less
+        memory than the list returned by get. The gain is the typed columns, which hand off to numpy / pandas without
+        a copy (and stay small once the source dict is released).
+        """
+        buffer = JsonHelperColumns(with_paths=with_paths)
+        value_path_sequence = [e for e in value_path.split('/') if e != '']
+
+        self._collect(self.data, value_path_sequence, 0, default, buffer, '' if with_paths else None)
+        return buffer
+
+    @staticmethod
+    def _add_match(buffer: JsonHelperColumns, value, path):
+        if isinstance(value, list):
+            if path is None:
+                for element in value:
+                    buffer.add(element)
+            else:
+                for index, element in enumerate(value):
+                    buffer.add(element, '%s/%s' % (path, index))
+        else:
+            buffer.add(value, path)
+
+    @staticmethod
+    def _add_default(buffer: JsonHelperColumns, default):
+        if isinstance(default, list):
+            for element in default:
+                buffer.add(element)
+        else:
+            buffer.add(default)
+
+    def _collect(self, data, value_path_sequence, position, default, buffer, path):
+        sequence_len = len(value_path_sequence)
+
+        # Plain keys are resolved in a loop, only the macros recurse
+        while position < sequence_len:
+            path_element = value_path_sequence[position]
+
+            if '{*}' in path_element or '[*]' in path_element or '{R:(' in path_element:
+                break
+
+            data = data.get(path_element, {}) if isinstance(data, dict) else {}
+
+            if isinstance(data, dict) and not len(data.keys()) > 0:
+                self._add_default(buffer, default)
+                return
+
+            if path is not None: path = '%s/%s' % (path, path_element)
+            position += 1
+
+        if position >= sequence_len:
+            if isinstance(data, dict) and not len(data.keys()) > 0:
+                self._add_default(buffer, default)
+            else:
+                self._add_match(buffer, data, path)
+            return
+
+        position += 1
+
+        if '{R:(' in path_element:
+            key_patterns = re.search(r'\{R:\((.+)?\)\}', path_element, re.IGNORECASE)
+
+            if not key_patterns or not isinstance(data, dict):
+                return
+
+            items = [(key, value) for key, value in data.items()
+                     if any(re.match(key_pattern, key, re.IGNORECASE) for key_pattern in key_patterns.groups())]
+            skip_empty = True
+        else:
+            if position >= sequence_len:
+                self._add_match(buffer, data, path)
+                return
+
+            if isinstance(data, dict):
+                items = data.items()
+            elif isinstance(data, list):
+                items = enumerate(data)
+            else:
+                return
+
+            skip_empty = '{*}' in path_element
+
+        for key, value in items:
+            if skip_empty and isinstance(value, dict) and not len(value.keys()) > 0:
+                self._add_default(buffer, default)
+            else:
+                self._collect(value, value_path_sequence, position, default, buffer, None if path is None else '%s/%s' % (path, key))
+
+    def get(self, value_path: str, default, nested_dict=None, results=None, formatter=None, where=None, columns=False, with_paths=False):
         """
         Macros:
          - {*} - Go over all dict keys (at current depth)
          - [*] - Go over all list elements (at current depth)
          - {R:(<pattern>)} - Go over all dict keys (at current depth) that match given <pattern>
+
+        columns: When True, the matches are collected straight into a JsonHelperColumns buffer (see get_columns).
+                 Cannot be combined with nested_dict, results, formatter or where.
+        with_paths: When True (and columns is True), every value keeps its matched concrete path (e.g. /items/3/value).
         """
+        if columns:
+            if nested_dict is not None or results is not None or formatter or where is not None:
+                raise Exception('columns=True cannot be combined with nested_dict, results, formatter or where!')
+
+            return self.get_columns(value_path, default, with_paths=with_paths)
+
+        if with_paths:
+            raise Exception('with_paths=True requires columns=True!')
+
         if formatter is None: formatter = []
 
         def format_result(res, where=None):
@@ -180,4 +369,17 @@ class JsonHelper(object):
                             else:
                                 pass
 
-                return format_result(results, where)
\ No newline at end of file
+                return format_result(results, where)
+
+
+TestMode = False
+if TestMode:
+    metrics = JsonHelper({'hosts': [{'name': 'a', 'cpu': 0.5, 'mem': 512}, {'name': 'b', 'cpu': 0.25, 'mem': 1024}], 'll': [[1, 2], [3]]})
+
+    print(metrics.get('/hosts/[*]/cpu', default=None))  # [0.5, 0.25]
+    cpu = metrics.get('/hosts/[*]/cpu', default=None, columns=True, with_paths=True)
+    print(cpu.floats, cpu.paths)  # array('d', [0.5, 0.25]) ['/hosts/0/cpu', '/hosts/1/cpu']
+    print(metrics.get('/hosts/[*]/mem', default=None, columns=True).integers)  # array('q', [512, 1024])
+    names = metrics.get('/hosts/[*]/name', default=None, columns=True)
+    print(names.string_codes, names.string_table)  # array('q', [0, 1]) ['a', 'b']
+    print(list(metrics.get('/ll/[*]', default=None, columns=True).values()))  # [[1, 2], [3]] - same as get
@@ -0,0 +1,272 @@
+import copy
+import threading
+import multiprocessing
+from collections.abc import Iterable, Mapping
+from queue import Queue
+from concurrent.futures import ProcessPoolExecutor
+
+class pipeline_stage_types(object):
+    THREAD = 1
+    PROCESS = 2
+
+class PipelineStage(object):
+
+    def __init__(self, name: str, fn, workers: int = 1, stage_type: int = pipeline_stage_types.THREAD, queue_size: int = None, fan_out=False):
+        """
+            name: The stage name (added as a note to the exceptions raised by the stage).
+            fn: The callable applied to every item received by the stage. For PROCESS stages it must be picklable (module level function).
+            workers: Number of items processed concurrently by the stage.
+            stage_type: pipeline_stage_types.THREAD for I/O bound work (fetch), pipeline_stage_types.PROCESS for CPU bound work (extraction).
+            queue_size: Max number of items waiting in front of the stage. Defaults to 2 * workers. A full queue blocks the upstream stage (backpressure).
+            fan_out: When True and fn returns an iterable (list, tuple, generator - but not str, bytes or dict), every element is passed downstream as a separate item.
+                     PROCESS stages must return a list/tuple, since generators cannot be sent back from a worker process.
+        """
+        if workers < 1: raise Exception('Stage "%s" requires at least one worker!' % name)
+        if stage_type not in [pipeline_stage_types.THREAD, pipeline_stage_types.PROCESS]:
+            raise Exception('Unsupported stage type id: %s' % str(stage_type))
+
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.stage_type = stage_type
+        self.queue_size = queue_size if queue_size is not None else 2 * workers
+        self.fan_out = fan_out
+
+class _EmptyAccumulator(object):
+    """ Marks an accumulator that has not seen any row yet (None cannot be used, since it may be a real 'first' value) """
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return 'EMPTY_ACCUMULATOR'
+
+EMPTY_ACCUMULATOR = _EmptyAccumulator()
+
+def append_aggregator(acc, item):
+    acc.append(item)
+    return acc
+
+class _UniqueList(list):
+    """ A list that remembers its members in a set, so the 'unique' aggregation stays O(1) per row """
+
+    def __init__(self, values=()):
+        super().__init__()
+        self._seen = set()
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        if value not in self._seen:
+            self._seen.add(value)
+            self.append(value)
+
+def _aggregate(value, exists: bool, row: dict, template: dict):
+
+    agg_func = template['agg']
+    column = template.get('values')
+
+    if agg_func == 'count':
+        return value + 1 if exists else 1
+
+    if not column:
+        raise ValueError(f"A 'values' key is required for '{agg_func}' aggregation.")
+
+    if agg_func == 'list':
+        value = value if exists else []
+        value.append(row[column])
+        return value
+    elif agg_func == 'unique':
+        if not isinstance(value, _UniqueList):
+            value = _UniqueList(value if exists else ())
+        value.add(row[column])
+        return value
+    elif agg_func == 'first':
+        return value if exists else row[column]
+    elif agg_func == 'sum':
+        return value + row[column] if exists else row[column]
+    else:
+        raise ValueError(f"Unsupported aggregation function: '{agg_func}'")
+
+def update_nested_dict(acc, row: dict, template):
+    """
+    Incrementally folds a single row (dict) into a nested dictionary, following the same template
+    rules as ascii_tree.dataframe_to_nested_dict, so the result can be built while the rows are still streaming.
+
+    Start with acc=EMPTY_ACCUMULATOR (e.g. Pipeline(initial=EMPTY_ACCUMULATOR)) and keep passing the returned value back in.
+    For a top-level string or 'agg' template the result is the list / scalar itself, otherwise a nested dict
+    (None or {} are accepted as the start value too, but only for grouping templates).
+
+    Supported 'agg' values: 'list', 'unique', 'count', 'sum', 'first'.
+    Note: Group keys keep the arrival order (dataframe_to_nested_dict returns them sorted).
+    """
+
+    if isinstance(template, str):
+        template = {'agg': 'list', 'values': template}
+
+    if 'agg' in template:
+        return _aggregate(acc, acc is not EMPTY_ACCUMULATOR, row, template)
+
+    if acc is None or acc is EMPTY_ACCUMULATOR: acc = {}
+
+    group_by_column = list(template.keys())[0]
+    next_template = template[group_by_column]
+    group_name = row[group_by_column]
+
+    if isinstance(next_template, str):
+        next_template = {'agg': 'list', 'values': next_template}
+
+    if 'agg' in next_template:
+        acc[group_name] = _aggregate(acc.get(group_name), group_name in acc, row, next_template)
+    else:
+        acc[group_name] = update_nested_dict(acc.get(group_name, EMPTY_ACCUMULATOR), row, next_template)
+
+    return acc
+
+class Pipeline(object):
+    """
+    Runs a chain of PipelineStage objects as streaming stages connected with bounded queues.
+
+    Every item produced by the source flows through the stages one by one, so the stages run concurrently
+    and the throughput is limited by the slowest stage. The results of the last stage are folded into the
+    accumulator with aggregator(acc, item) as soon as they arrive. Item order is not preserved.
+    """
+    _end = object()
+
+    def __init__(self, stages: list, aggregator=None, initial=list):
+        """
+            stages: The list of PipelineStage objects, in processing order.
+            aggregator: aggregator(acc, item) -> acc, called for every item leaving the last stage. Defaults to append_aggregator.
+            initial: The starting accumulator. A callable (e.g. list, dict) is called at the start of every run, any other value is deep copied.
+        """
+        if not stages: raise Exception('Pipeline requires at least one stage!')
+
+        self.stages = stages
+        self.aggregator = aggregator if aggregator is not None else append_aggregator
+        self.initial = initial
+
+    def run(self, source):
+        """
+            source: Any iterable (list, generator) of input items, e.g. time frames built with date.build_time_frame.
+            Returns the final accumulator. The first exception raised by any stage (or the aggregator) is re-raised as is after the pipeline is drained.
+        """
+        acc = self.initial() if callable(self.initial) else copy.deepcopy(self.initial)
+        errors = []
+        queues = [Queue(maxsize=stage.queue_size) for stage in self.stages]
+        out_queue = Queue(maxsize=self.stages[-1].queue_size)
+        pools = {}
+
+        for index, stage in enumerate(self.stages):
+            if stage.stage_type == pipeline_stage_types.PROCESS:
+                # spawn, since forking a process that already runs threads (and may hold their locks) can deadlock the children
+                pools[index] = ProcessPoolExecutor(max_workers=stage.workers, mp_context=multiprocessing.get_context('spawn'))
+
+        def feed():
+            try:
+                for item in source:
+                    if errors: break
+                    queues[0].put(item)
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                for _ in range(self.stages[0].workers):
+                    queues[0].put(self._end)
+
+        def work(index, stage, pending):
+            in_queue = queues[index]
+            next_queue = queues[index + 1] if index + 1 < len(queues) else out_queue
+            next_workers = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+
+            try:
+                while True:
+                    item = in_queue.get()
+                    if item is self._end: break
+                    if errors: continue  # Keep draining, so that upstream stages never block on a full queue
+
+                    try:
+                        if index in pools:
+                            res = pools[index].submit(stage.fn, item).result()
+                        else:
+                            res = stage.fn(item)
+
+                        if stage.fan_out and isinstance(res, Iterable) and not isinstance(res, (str, bytes, Mapping)):
+                            for element in res:
+                                next_queue.put(element)
+                        else:
+                            next_queue.put(res)
+                    except BaseException as e:
+                        if hasattr(e, 'add_note'): e.add_note('Pipeline stage: %s' % stage.name)
+                        errors.append(e)
+            finally:
+                # Always hand over the end marker, otherwise the downstream stages (and run) would wait forever
+                with pending['lock']:
+                    pending['count'] -= 1
+                    if pending['count'] == 0:
+                        for _ in range(next_workers):
+                            next_queue.put(self._end)
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        for index, stage in enumerate(self.stages):
+            pending = {'lock': threading.Lock(), 'count': stage.workers}
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(target=work, args=(index, stage, pending), daemon=True))
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = out_queue.get()
+                if item is self._end: break
+                if errors: continue
+
+                try:
+                    acc = self.aggregator(acc, item)
+                except BaseException as e:
+                    errors.append(e)
+
+            for thread in threads:
+                thread.join()
+        finally:
+            for pool in pools.values():
+                pool.shutdown()
+
+        if errors:
+            raise errors[0]
+
+        return acc
+
+
+# Example stages live at module level, so PROCESS workers can resolve them under the spawn start method (macOS/Windows)
+def _example_fetch(time_frame):
+    # Usually: web_client.request(url='https://example.com/metrics?from=<from>&to=<to>', url_params=time_frame).json()
+    return {'items': [{'color': 'Red', 'type': 'Apple', 'quantity': 10}, {'color': 'Green', 'type': 'Apple', 'quantity': 5}]}
+
+def _example_extract(response):
+    from json_dict import JsonHelper
+    return JsonHelper(response).get('/items', default=[])
+
+TestMode = False
+if TestMode and __name__ == '__main__':
+    import json
+    from datetime import datetime, timedelta
+    from date import build_time_frame
+    from ascii_tree import dict_to_ascii_tree
+
+    windows = (build_time_frame(datetime(2025, 6, 1) + timedelta(days=i), format_values=True) for i in range(7))
+    template = {'color': {'type': {'agg': 'sum', 'values': 'quantity'}}}
+
+    result = Pipeline(
+        stages=[
+            PipelineStage('fetch', _example_fetch, workers=8, stage_type=pipeline_stage_types.THREAD),
+            PipelineStage('extract', _example_extract, workers=2, stage_type=pipeline_stage_types.PROCESS, fan_out=True),
+        ],
+        aggregator=lambda acc, row: update_nested_dict(acc, row, template),
+        initial=EMPTY_ACCUMULATOR,
+    ).run(windows)
+
+    print(json.dumps(result, indent=4))
+    print(dict_to_ascii_tree(result))